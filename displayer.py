@@ -3,6 +3,11 @@
 # Caiden Wiley, 2024
 # Adapted from template code from https://www.waveshare.com/product/displays/oled/1.51inch-transparent-oled.htm
 
+'''
+Deprecated. The maintained code lives in the radio/ package; this script
+is kept as a known-working reference for the display + VLC path.
+'''
+
 '''
 Components:
 OLED screen (7 pins)
@@ -41,7 +46,10 @@ if os.path.exists(libdir):
     sys.path.append(libdir)
 
 import time
-import math
+import functools
+import queue
+import threading
+import numpy as np
 import OLED_1in51
 import vlc
 from PIL import Image,ImageDraw,ImageFont
@@ -56,6 +64,9 @@ FONT_RESOURCE = os.path.join(assetdir, 'noto_mono.ttf')
 # Enables debug output
 DEBUG_MODE = False
 
+# Every possible zero-padded station string, built once.
+_STATION_STRS = [f"{i:03d}" for i in range(1000)]
+
 class Player:
     def __init__(self, url_list):
         self.url_list = url_list
@@ -64,15 +75,26 @@ class Player:
         self.instance = vlc.Instance()
         self.player = self.instance.media_player_new()
         self.media = None
-    
+        # Kept current by the MediaMetaChanged listener so readers never
+        # take VLC's media lock.
+        self.now_playing = 'Nothing!'
+
     def _current_url(self):
         return self.url_list[self.current_station]
-    
+
+    def _on_meta_changed(self, event):
+        if self.media is None:
+            return
+        meta = self.media.get_meta(vlc.Meta.NowPlaying)
+        self.now_playing = meta if meta is not None else 'Nothing!'
+
     def _init_media(self):
         print("\n> Initializing media source: " + str(self._current_url()))
         self.media = self.instance.media_new(self._current_url())
         self.player.set_media(self.media)
-    
+        self.now_playing = 'Nothing!'
+        self.media.event_manager().event_attach(vlc.EventType.MediaMetaChanged, self._on_meta_changed)
+
     def play(self):
         if self.media == None:
             self._init_media()
@@ -83,7 +105,10 @@ class Player:
     
     def stop(self):
         self.player.stop()
+        if self.media is not None:
+            self.media.event_manager().event_detach(vlc.EventType.MediaMetaChanged)
         self.media = None
+        self.now_playing = 'Nothing!'
     
     def get_meta(self, e_meta):
         if self.media is None or self.media.get_meta(e_meta) is None:
@@ -95,13 +120,17 @@ class Player:
         return self.get_meta(vlc.Meta.Title)
     
     def get_now_playing(self):
-        return self.get_meta(vlc.Meta.NowPlaying)
+        return self.now_playing
     
     def select_station(self, num):
-        was_playing = self.player.is_playing()
-        self.player.stop()
         # Loop index selecton if out of bounds.
         index = num % len(self.url_list)
+        # Reconnecting to the same stream takes seconds; don't tear the
+        # media down if the selection didn't actually change.
+        if index == self.current_station and self.media is not None:
+            return
+        was_playing = self.player.is_playing()
+        self.player.stop()
         self.current_station = index
         self._init_media()
         if was_playing:
@@ -116,6 +145,11 @@ def get_time_now_ms():
 def debug_print(text):
     if (DEBUG_MODE): print(text)
 
+# Loading a font reopens and reparses the TTF file, so keep one instance per size.
+@functools.lru_cache(maxsize=16)
+def _get_font(size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(FONT_RESOURCE, size)
+
 def generate_text_image(text: str, pos: tuple[int, int], font_size: int, image_in: Image = None) -> Image:
     debug_print("Generating text " + text + " at " + str(pos))
     if (image_in):
@@ -123,19 +157,19 @@ def generate_text_image(text: str, pos: tuple[int, int], font_size: int, image_i
     else:
         image = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")
     draw = ImageDraw.Draw(image)
-    font = ImageFont.truetype(FONT_RESOURCE, font_size)
+    font = _get_font(font_size)
     draw.text(pos, text, font = font, fill = 0)
     return image
 
+# Where in the text the scroll window currently starts.
 # max_chars = number of characters to display at a given time, ie. effective width in characters.
-# scroll_time_ms = time in ms to scroll 1 character width
+# scroll_speed_ms = time in ms to scroll 1 character width
 # initial_time_ms = time in which the scroll started at the beginning
-def generate_scrolling_text_image(text: str, pos: tuple[int, int], font_size: int, max_chars: int, scroll_speed_ms: int, initial_time_ms: int, image_in: Image = None) -> Image:
-    # TODO generate text snippit based on input parameters
+def get_scroll_char_index(text: str, max_chars: int, scroll_speed_ms: int, initial_time_ms: int) -> int:
     overflow_size = len(text) - max_chars
-    # If length of text fits within bounds, we don't need to do anything
+    # If length of text fits within bounds, we don't scroll at all
     if overflow_size <= 0:
-        return generate_text_image(text, pos, font_size, image_in=image_in)
+        return 0
 
     first_char_hold_add = 3
     last_char_hold_add = 3
@@ -145,28 +179,85 @@ def generate_scrolling_text_image(text: str, pos: tuple[int, int], font_size: in
     time_since_initial = get_time_now_ms() - initial_time_ms
     cycle_position_ms = time_since_initial % cycle_length_ms
     cycle_discrete = first_char_hold_add + overflow_size + last_char_hold_add
-    cycle_index = math.floor((cycle_position_ms / cycle_length_ms) * cycle_discrete)
-    char_index = min(max(cycle_index - first_char_hold_add, 0), overflow_size)
+    # All operands are ints, so floor division is exact and avoids the
+    # float round trip through math.floor
+    cycle_index = (cycle_position_ms * cycle_discrete) // cycle_length_ms
+    return min(max(cycle_index - first_char_hold_add, 0), overflow_size)
 
+# max_chars = number of characters to display at a given time, ie. effective width in characters.
+# scroll_time_ms = time in ms to scroll 1 character width
+# initial_time_ms = time in which the scroll started at the beginning
+def generate_scrolling_text_image(text: str, pos: tuple[int, int], font_size: int, max_chars: int, scroll_speed_ms: int, initial_time_ms: int, image_in: Image = None) -> Image:
+    char_index = get_scroll_char_index(text, max_chars, scroll_speed_ms, initial_time_ms)
     truncated_text = text[char_index:char_index+max_chars]
     return generate_text_image(truncated_text, pos, font_size, image_in=image_in)
 
 def wait(sec: int):
     time.sleep(sec)
 
+# Vectorized replacement for disp.getbuffer. The driver packs each page's
+# 8 rows into per-column bytes with a Python loop over every pixel; packbits
+# does the same layout (bit 0 = top row of the page) in one pass.
+def get_buffer_fast(image: Image, rotate_180: bool = False) -> bytes:
+    arr = np.asarray(image.convert('1'), dtype=np.uint8)
+    if rotate_180:
+        # Stride flip on the pixel array; much cheaper than image.rotate(180)
+        arr = arr[::-1, ::-1]
+    pages = arr.reshape(OLED_HEIGHT // 8, 8, OLED_WIDTH)
+    return np.packbits(pages, axis=1, bitorder='little').tobytes()
+
+# The SPI transfer is slow enough to stall the render loop, so frames are
+# handed to a background thread through a 1-deep queue. A newer frame
+# replaces a stale queued one instead of back-pressuring the UI.
+_frame_queue = queue.Queue(maxsize=1)
+_display_lock = threading.Lock()
+
+def _display_worker(disp: OLED_1in51):
+    while True:
+        buf = _frame_queue.get()
+        with _display_lock:
+            disp.ShowImage(buf)
+
+def start_display_thread(disp: OLED_1in51) -> threading.Thread:
+    thread = threading.Thread(target=_display_worker, args=(disp,))
+    thread.daemon = True
+    thread.start()
+    return thread
+
 def draw_image(disp: OLED_1in51, image: Image):
-    image = image.rotate(180)
-    disp.ShowImage(disp.getbuffer(image))
+    buf = get_buffer_fast(image, rotate_180=True)
+    try:
+        _frame_queue.put_nowait(buf)
+    except queue.Full:
+        try:
+            _frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+        _frame_queue.put_nowait(buf)
+
+# The 35pt clock is by far the most expensive text to rasterize and it only
+# changes once a minute, so cache the rendered base layer per "HH:MM" string.
+# The static separator line is baked into the same layer.
+@functools.lru_cache(maxsize=1440)
+def _render_clock_base(time_str: str) -> Image:
+    base = generate_text_image(time_str, (5, 0), 35)
+    draw = ImageDraw.Draw(base)
+    draw.line([(27, 42), (27, 58)], None, 1)
+    return base
+
+# Only 1000 possible zero-padded station strings, so cache their strips too.
+@functools.lru_cache(maxsize=1000)
+def _render_station_number(station_str: str) -> Image:
+    strip = Image.new('1', (22, 14), "WHITE")
+    return generate_text_image(station_str, (0, 0), 10, image_in=strip)
 
 # TODO: Add other state info (station #, alarm set, alarm going off, mode)
 def generate_clock_hud_image(time: str, track: str, station: int, start_time: int = 0) -> Image:
-    station_str = (3 - len(str(station)))*"0" + str(station)
-    clock = generate_text_image(time, (5, 0), 35)
+    station_str = _STATION_STRS[station]
+    clock = _render_clock_base(time).copy()
     add_track_name = generate_scrolling_text_image(track, (31, 45), 10, 13, 300, start_time, image_in=clock)
-    add_station_number = generate_text_image(station_str, (5, 45), 10, image_in=add_track_name)
-    draw = ImageDraw.Draw(add_station_number)
-    draw.line([(27, 42), (27, 58)], None, 1)
-    return add_station_number
+    add_track_name.paste(_render_station_number(station_str), (5, 45))
+    return add_track_name
     
 
 # Initialize Player object with station list
@@ -177,18 +268,27 @@ print(url_list)
 player = Player(url_list)
 player.select_station(2)
 
-# TODO: Only update screen when a change in the display variables is detected
 try:
     disp = OLED_1in51.OLED_1in51()
     disp.Init()
     disp.clear()
+    start_display_thread(disp)
 
     player.play()
 
     last_track_name = player.get_now_playing()
     start_time = get_time_now_ms()
+    last_state = None
+    last_minute = -1
+    clock_time = ""
     while True:
-        clock_time = time.strftime("%H:%M", time.localtime())
+        # strftime/localtime go through libc timezone lookups; the result
+        # only changes once a minute, so only reformat on rollover.
+        now = time.time()
+        minute = int(now // 60)
+        if minute != last_minute:
+            clock_time = time.strftime("%H:%M", time.localtime(now))
+            last_minute = minute
         track_name = player.get_now_playing()
         station_number = player.get_station_index()
 
@@ -197,9 +297,14 @@ try:
             start_time = get_time_now_ms()
             last_track_name = track_name
 
-        hud_image = generate_clock_hud_image(clock_time, track_name, station_number)
-        draw_image(disp, hud_image)
-        # wait(0.1)
+        # Only update screen when a change in the display variables is detected
+        char_index = get_scroll_char_index(track_name, 13, 300, start_time)
+        state = (clock_time, station_number, track_name, char_index)
+        if state != last_state:
+            last_state = state
+            hud_image = generate_clock_hud_image(clock_time, track_name, station_number, start_time)
+            draw_image(disp, hud_image)
+        wait(0.02)
     
     # Shut down
     disp.clear()
@@ -1,3 +1,8 @@
+'''
+Deprecated. The maintained code lives in the radio/ package; this script
+is kept as a known-working reference for the rotary encoder path.
+'''
+
 import sys
 import os
 assetdir = os.path.realpath('asset')
@@ -6,7 +11,7 @@ if os.path.exists(libdir):
     sys.path.append(libdir)
 
 import asyncio
-import math
+import functools
 import evdev
 import time
 import threading
@@ -33,6 +38,7 @@ I don't know if the /dev/input/eventX will change based on platform or other fac
 # In case these settings need to be changed.
 ROTARY_BUTTON_KEYCODE = 28
 BUTTON_LONG_PRESS_DURATION_MS = 1000
+ROTATION_COALESCE_MS = 50
 
 # Dimensions of 1.5 inch transparent OLED screen
 OLED_WIDTH   = 128
@@ -41,9 +47,17 @@ OLED_HEIGHT  = 64
 # Default font location
 FONT_RESOURCE = os.path.join(assetdir, 'noto_mono.ttf')
 
+# Every possible zero-padded station string, built once.
+_STATION_STRS = [f"{i:03d}" for i in range(1000)]
+
 def get_time_now_ms():
     return time.time_ns() // 1_000_000
 
+# Loading a font reopens and reparses the TTF file, so keep one instance per size.
+@functools.lru_cache(maxsize=16)
+def _get_font(size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(FONT_RESOURCE, size)
+
 class RotaryEncoder:
     # Constructor inputs are device paths, eg, '/dev/input/event3'
     def __init__(self, rotary_device, rotary_button_device, rotate_left_callback, rotate_right_callback, button_callback, button_long_callback):
@@ -55,30 +69,48 @@ class RotaryEncoder:
         self.button = False
         self.button_start_time = 0
         self.button_timer = None
-        
+
+        self.rotation_accumulator = 0
+        self.rotation_flush_handle = None
+
         self.rotary_device = evdev.InputDevice(rotary_device)
         self.rotary_button_device = evdev.InputDevice(rotary_button_device)
     
     async def start(self):
-        await asyncio.gather(
-            self.handle_rotation(self.rotary_device),
-            self.handle_button(self.rotary_button_device)
-        )
-        
-    async def handle_rotation(self, device):
-        async for event in device.async_read_loop():
+        # Wake once per readable fd and drain every pending rotation event,
+        # instead of paying a loop round-trip per event.
+        loop = asyncio.get_event_loop()
+        loop.add_reader(self.rotary_device.fileno(), self._drain_rotation)
+        await self.handle_button(self.rotary_button_device)
+
+    def _drain_rotation(self):
+        loop = asyncio.get_event_loop()
+        for event in self.rotary_device.read():
             if event.type != 2: # REL_X
                 continue
-            if event.value == 1:
-                self.rotate_left_callback()
-            if event.value == -1:
-                self.rotate_right_callback()
+            # A fast spin emits many events within a few ms; accumulate them
+            # and flush once so the callbacks only run for the net rotation.
+            self.rotation_accumulator += event.value
+        if self.rotation_flush_handle is None:
+            self.rotation_flush_handle = loop.call_later(ROTATION_COALESCE_MS / 1000, self._flush_rotation)
 
-    def _check_button_long(self):
-        if self.button and get_time_now_ms() - self.button_start_time >= BUTTON_LONG_PRESS_DURATION_MS:
+    def _flush_rotation(self):
+        self.rotation_flush_handle = None
+        delta = self.rotation_accumulator
+        self.rotation_accumulator = 0
+        if delta == 0:
+            return
+        callback = self.rotate_left_callback if delta > 0 else self.rotate_right_callback
+        for _ in range(abs(delta)):
+            callback()
+
+    async def _long_press_watcher(self, start):
+        await asyncio.sleep(BUTTON_LONG_PRESS_DURATION_MS / 1000)
+        # Only fire if this press is still the one we started watching
+        if self.button and self.button_start_time == start:
             self.button_start_time = 0
             self.button_long_callback()
-            
+
     async def handle_button(self, device):
         async for event in device.async_read_loop():
             if event.code != ROTARY_BUTTON_KEYCODE:
@@ -86,8 +118,9 @@ class RotaryEncoder:
             if event.value == 1:
                 self.button = True
                 self.button_start_time = get_time_now_ms()
-                self.button_timer = threading.Timer(BUTTON_LONG_PRESS_DURATION_MS/1000, self._check_button_long)
-                self.button_timer.start()
+                # A task on the loop, not a threading.Timer: no thread is
+                # spawned per button press.
+                self.button_timer = asyncio.create_task(self._long_press_watcher(self.button_start_time))
             else:
                 if self.button == True:
                     # Button has just been depressed
@@ -115,20 +148,26 @@ class UserInterface:
         self.display.Init()
         self.display.clear()
 
+        # Input handlers set this instead of drawing; the main loop waits
+        # on it so the UI thread idles between events.
+        self.redraw_event = threading.Event()
+
     def button_short(self):
         print("button_short")
         if self.mode == "mode":
             self.mode = self.highlighted_mode
         else:
             self.mode = "mode"
+        self.redraw_event.set()
     def button_long(self):
         print("button_long")
         if self.mode == "station":
-            self.station_active != self.station_active
+            self.station_active = not self.station_active
             # TODO: Toggle sound
         if self.mode == "alarm":
-            self.alarm_active != self.alarm_active
+            self.alarm_active = not self.alarm_active
             # TODO: Toggle alarm (Where does it activate?)
+        self.redraw_event.set()
     def rotate_left(self):
         print("rotate_left")
         self.rotate(-1)
@@ -137,16 +176,10 @@ class UserInterface:
         self.rotate(1)
     def rotate(self, direction):
         if self.mode == "mode":
-            # We're switching the highlighted mode here
-            # Hard coded because simple.
-            if direction < 0:
-                if self.highlighted_mode == "time": self.highlighted_mode = "station"
-                if self.highlighted_mode == "alarm": self.highlighted_mode = "time"
-                if self.highlighted_mode == "station": self.highlighted_mode = "alarm"
-            if direction > 0:
-                if self.highlighted_mode == "station": self.highlighted_mode = "time"
-                if self.highlighted_mode == "time": self.highlighted_mode = "alarm"
-                if self.highlighted_mode == "alarm": self.highlighted_mode = "station"
+            # Step the highlighted mode by index. The old if-chain could
+            # re-fire on the value it had just assigned and skip a mode.
+            index = self.modes.index(self.highlighted_mode)
+            self.highlighted_mode = self.modes[(index + direction) % len(self.modes)]
         if self.mode == "time":
             # TODO: Change time
             pass
@@ -159,19 +192,28 @@ class UserInterface:
                 self.station = self.station_count-1
             if self.station >= self.station_count:
                 self.station = 0
+        self.redraw_event.set()
 
-    def _generate_text_image(self, text: str, pos: tuple[int, int], font_size: int, image_in: Image = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")) -> Image:
+    def _generate_text_image(self, text: str, pos: tuple[int, int], font_size: int, image_in: Image = None) -> Image:
+        # A default of Image.new(...) would be evaluated once and shared
+        # between every call, accumulating old draws.
+        if image_in is None:
+            image_in = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")
         draw = ImageDraw.Draw(image_in)
-        font = ImageFont.truetype(FONT_RESOURCE, font_size)
+        font = _get_font(font_size)
         draw.text(pos, text, font = font, fill = 0)
         return image_in
     
-    def _generate_circle_image(self, box: tuple[tuple[int, int], tuple[int, int]], filled: bool, image_in: Image = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")) -> Image:
+    def _generate_circle_image(self, box: tuple[tuple[int, int], tuple[int, int]], filled: bool, image_in: Image = None) -> Image:
+        if image_in is None:
+            image_in = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")
         draw = ImageDraw.Draw(image_in)
         draw.ellipse(box, "WHITE" if filled else None, "WHITE")
         return image_in
 
-    def _generate_box_image(self, box: tuple[tuple[int, int], tuple[int, int]], thickness: float, image_in: Image = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")) -> Image:
+    def _generate_box_image(self, box: tuple[tuple[int, int], tuple[int, int]], thickness: float, image_in: Image = None) -> Image:
+        if image_in is None:
+            image_in = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")
         draw = ImageDraw.Draw(image_in)
         draw.rectangle(box, None, "WHITE", thickness)
         return image_in
@@ -189,7 +231,8 @@ class UserInterface:
         time_since_initial = get_time_now_ms() - initial_time_ms
         cycle_position_ms = time_since_initial % cycle_length_ms
         cycle_discrete = first_char_hold_add + overflow_size + last_char_hold_add
-        cycle_index = math.floor((cycle_position_ms / cycle_length_ms) * cycle_discrete)
+        # Integer floor division; all operands are ints
+        cycle_index = (cycle_position_ms * cycle_discrete) // cycle_length_ms
         char_index = min(max(cycle_index - first_char_hold_add, 0), overflow_size)
 
         truncated_text = text[char_index:char_index+max_chars]
@@ -198,10 +241,11 @@ class UserInterface:
     def draw(self, track_name: str, track_start_time: int):
         # draw clock
         wrapped_time = self.time % (24*60*60*1000)
-        time_string = str(math.floor(wrapped_time / (60*60*1000))) + ":" + str(math.floor((wrapped_time % (60*60*1000)) / (60 * 1000)))
+        hours, minutes = divmod(wrapped_time // (60*1000), 60)
+        time_string = f"{hours:d}:{minutes:02d}"
         clock = self._generate_text_image(time_string, (5, 0), 35)
         # draw station number
-        station_number_string = (3 - len(str(self.station)))*"0" + str(self.station)
+        station_number_string = _STATION_STRS[self.station]
         add_station_number = self._generate_text_image(station_number_string, (5, 45), 10, image_in=clock)
         # draw divider
         draw = ImageDraw.Draw(add_station_number)
@@ -251,6 +295,9 @@ def main():
         global ui
         print("Active")
         while True:
+            # Redraw on input events; the timeout keeps the clock ticking.
+            ui.redraw_event.wait(timeout=1.0)
+            ui.redraw_event.clear()
             ui.draw("test track", 0)
     finally:
         ui.clear()
@@ -41,7 +41,7 @@ libdir = os.path.realpath('radio/lib')     # For OLED_1in51.py
 if os.path.exists(libdir):
     sys.path.append(libdir)
 
-import asyncio, math, evdev, time, threading, vlc
+import asyncio, functools, evdev, time, threading, vlc
 import OLED_1in51 # Located in libdir
 from PIL import Image,ImageDraw,ImageFont
 from enum import Enum
@@ -90,6 +90,11 @@ SCREEN_FRAME_UPDATE_DURATION_MS = 150
 def time_now() -> int:
     return time.time_ns() // 1_000_000
 
+# Loading a font reopens and reparses the TTF file, so keep one instance per size.
+@functools.lru_cache(maxsize=16)
+def _get_font(size: int) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(FONT_RESOURCE, size)
+
 
 ##########
 ### Classes
@@ -115,6 +120,7 @@ class UserInterface:
         self.station_active = False
 
         self.track_start_time = 0
+        self.track_slices = [""]
 
         self.display = OLED_1in51.OLED_1in51()
         self.display.Init()
@@ -128,6 +134,25 @@ class UserInterface:
         self.queued_image = None
         self.last_draw = time_now()
         self.update_timer = None
+        self.last_drawn_state = None
+
+        # Preload the two font sizes draw_ui uses
+        self._time_font = _get_font(35)
+        self._station_font = _get_font(10)
+
+        # Static layer: separator and mode circle outlines never change,
+        # so draw them once and start each frame from a copy.
+        self._bg_template = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")
+        bg_draw = ImageDraw.Draw(self._bg_template)
+        bg_draw.line([(27, 42), (27, 58)], None, 1)
+        bg_draw.ellipse([(120, 10), (126, 16)], "WHITE", 0, 1) # Station Mode
+        bg_draw.ellipse([(120, 25), (126, 31)], "WHITE", 0, 1) # Time Mode
+        bg_draw.ellipse([(120, 40), (126, 46)], "WHITE", 0, 1) # Alarm Mode
+
+        # Persistent frame buffer + draw handle, reset from the template
+        # each frame instead of reallocating both objects.
+        self._image = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")
+        self._draw = ImageDraw.Draw(self._image)
 
     def _get_scrolling_track_name(self, max_chars: int = 13, scroll_speed: int = 300, ends_hold_multiple: int = 3):
         overflow_size = len(self.track_name) - max_chars
@@ -138,16 +163,20 @@ class UserInterface:
         cycle_length = (scroll_speed * ends_hold_multiple * 2) + (overflow_size * scroll_speed)
         cycle_position = (time_now() - self.track_start_time) % cycle_length
         cycle_discrete = ends_hold_multiple*2 + overflow_size
-        cycle_index = math.floor((cycle_position / cycle_length) * cycle_discrete)
+        # Integer floor division; all operands are ints
+        cycle_index = (cycle_position * cycle_discrete) // cycle_length
         char_index = min(max(cycle_index - ends_hold_multiple, 0), overflow_size)
 
-        truncated_track_name = self.track_name[char_index:char_index+max_chars]
-        return truncated_track_name
-    
+        # Slices were all precomputed when the track name was set
+        return self.track_slices[char_index]
+
     def set_track_name(self, new_track_name: str) -> None:
         if new_track_name == self.track_name:
             return
         self.track_name = new_track_name
+        # Precompute every scroll window so the draw path never allocates
+        overflow_size = max(len(new_track_name) - self.max_chars, 0)
+        self.track_slices = [new_track_name[i:i+self.max_chars] for i in range(overflow_size + 1)]
         self.track_start_time = time_now()
         self._update_schedule()
 
@@ -219,32 +248,37 @@ class UserInterface:
         if self.update_required == False:
             return
         self.update_required = False
+
+        # Skip the redraw entirely if nothing on screen would change
+        scrolled_track_name = self._get_scrolling_track_name()
+        state = (self.time, self.station_number, scrolled_track_name, self.selected_mode,
+                 self.highlight_selector, self.alarm_active, self.station_active)
+        if state == self.last_drawn_state:
+            return
+        self.last_drawn_state = state
         print("Draw_ui called: UPDATING screen!")
 
-        image = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")
-        draw = ImageDraw.Draw(image)
-        time_font = ImageFont.truetype(FONT_RESOURCE, 35)
-        station_font = ImageFont.truetype(FONT_RESOURCE, 10)
+        self._image.paste(self._bg_template, (0, 0))
+        draw = self._draw
+        time_font = self._time_font
+        station_font = self._station_font
 
         # Draw time
         draw.text((5, 0), self.time, font = time_font, fill = 0)
         # Draw station number
         draw.text((5, 45), self.station_number, font = station_font, fill = 0)
-        # Draw separator
-        draw.line([(27, 42), (27, 58)], None, 1)
         # Draw track name
-        scrolled_track_name = self._get_scrolling_track_name()
         draw.text((31, 45), scrolled_track_name, font = station_font, fill = 0)
-        # Draw modes
-        draw.ellipse([(120, 10), (126, 16)], "WHITE", 0, 6 if self.station_active else 1) # Station Mode
-        draw.ellipse([(120, 25), (126, 31)], "WHITE", 0, 1) # Time Mode
-        draw.ellipse([(120, 40), (126, 46)], "WHITE", 0, 6 if self.alarm_active else 1) # Alarm Mode
+        # Fill in mode circles (outlines are part of the background template)
+        if self.station_active: draw.ellipse([(120, 10), (126, 16)], "WHITE", 0, 6) # Station Mode
+        if self.alarm_active:   draw.ellipse([(120, 40), (126, 46)], "WHITE", 0, 6) # Alarm Mode
         # Draw mode selection box
         if self.selected_mode == Mode.STATION: draw.line([(115, 12), (115, 14)], None, 3 if self.highlight_selector else 1)
         if self.selected_mode == Mode.TIME:    draw.line([(115, 27), (115, 29)], None, 3 if self.highlight_selector else 1)
         if self.selected_mode == Mode.ALARM:   draw.line([(115, 42), (115, 44)], None, 3 if self.highlight_selector else 1)
-        # Render drawings onto screen
-        image = image.rotate(180)
+        # Render drawings onto screen (rotate yields a fresh image, so the
+        # scheduled draw never aliases the reused frame buffer)
+        image = self._image.rotate(180)
         self._schedule_draw(image)
 
 
@@ -716,25 +750,29 @@ class Radio:
 ##########
 
 
-radio = Radio()
-encoder = Encoder()
-
-encoder.set_rotate_left_callback(radio.control_left)
-encoder.set_rotate_right_callback(radio.control_right)
-encoder.set_button_short_callback(radio.control_short_click)
-encoder.set_button_long_callback(radio.control_long_click)
-
-encoder.start()
-
-# Get station list from "station.list" and set it in the player
-url_list_file = 'station.list'
-with open(url_list_file, 'r') as file:
-    url_list = [line.strip() for line in file]
-print("Initializing with station list: ", url_list)
-radio.player.set_station_list(url_list)
-
-try:
-    while True:
-        radio.update()
-finally:
-    radio.ui.clear()
\ No newline at end of file
+# Guarded so importing this reference module doesn't start the radio
+if __name__ == "__main__":
+    radio = Radio()
+    encoder = Encoder()
+
+    encoder.set_rotate_left_callback(radio.control_left)
+    encoder.set_rotate_right_callback(radio.control_right)
+    encoder.set_button_short_callback(radio.control_short_click)
+    encoder.set_button_long_callback(radio.control_long_click)
+
+    encoder.start()
+
+    # Get station list from "station.list" and set it in the player
+    url_list_file = 'station.list'
+    with open(url_list_file, 'r') as file:
+        url_list = [line.strip() for line in file]
+    print("Initializing with station list: ", url_list)
+    radio.player.set_station_list(url_list)
+
+    try:
+        while True:
+            radio.update()
+            # Pace the loop; update work is dirty-gated so idle ticks are cheap
+            time.sleep(0.05)
+    finally:
+        radio.ui.clear()
\ No newline at end of file
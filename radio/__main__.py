@@ -1,26 +1,42 @@
 """Main code runner"""
+import asyncio
+import logging
+import os
 from radio_class import Radio
 from encoder_class import Encoder
 
-radio = Radio()
-encoder = Encoder()
+# Default to WARNING so hot paths short-circuit in Logger.isEnabledFor;
+# set RADIO_LOG=DEBUG for interactive debugging
+logging.basicConfig(level=os.environ.get('RADIO_LOG', 'WARNING'))
 
-encoder.set_rotate_left_callback(radio.control_left)
-encoder.set_rotate_right_callback(radio.control_right)
-encoder.set_button_short_callback(radio.control_short_click)
-encoder.set_button_long_callback(radio.control_long_click)
+# How often the update loop polls the player/clock for display changes
+UPDATE_INTERVAL_S = 0.15
 
-encoder.start()
-
-# Get station list from "station.list" and set it in the player
-URL_LIST_FILE = 'station.list'
-with open(URL_LIST_FILE, 'r', encoding='utf-8') as file:
-    url_list = [line.strip() for line in file]
-print("Initializing with station list: ", url_list)
-radio.player.set_station_list(url_list)
-
-try:
+async def update_loop(radio: Radio) -> None:
     while True:
         radio.update()
-finally:
-    radio.ui.clear()
+        await asyncio.sleep(UPDATE_INTERVAL_S)
+
+async def main() -> None:
+    radio = Radio()
+    encoder = Encoder()
+
+    encoder.set_scrub_callback(radio.control_scrub)
+    encoder.set_button_short_callback(radio.control_short_click)
+    encoder.set_button_long_callback(radio.control_long_click)
+
+    encoder.start()
+
+    # Get station list from "station.list" and set it in the player
+    URL_LIST_FILE = 'station.list'
+    with open(URL_LIST_FILE, 'r', encoding='utf-8') as file:
+        url_list = tuple(s for s in map(str.strip, file) if s)
+    logging.getLogger(__name__).info("Initializing with station list: %s", url_list)
+    radio.player.set_station_list(url_list)
+
+    try:
+        await update_loop(radio)
+    finally:
+        radio.ui.clear()
+
+asyncio.run(main())
@@ -2,11 +2,13 @@
 Clock class. Keeps track of user-defined time offset and alarm.
 """
 
-import threading
+import asyncio
+import logging
 import time
-from datetime import datetime
 from typing import Callable
 
+log = logging.getLogger(__name__)
+
 
 # Since we always have ms since epoch, "setting the time" should be as an offset to that.
 # Alarm is stored as minutes from 0000 (midnight) 
@@ -21,15 +23,25 @@ class Clock:
         self.alarm_active = False
         self.alarm_callback = None
         self.alarm_timer = None
+        # strftime output only changes once a minute; key the cache on the
+        # offset minute (so offset scrubs invalidate it) and keep both
+        # colon variants, since colon blink alternates between them
+        self._time_string_minute = None
+        self._time_string_colon = ""
+        self._time_string_space = ""
+        # The alarm only changes on a user scrub, so format it then rather
+        # than on every blink tick that displays it
+        self._alarm_string = " 0:00"
 
     def _seconds_through_day(self) -> int:
-        now = datetime.now()
-        start_of_day = datetime(year=now.year, month=now.month, day=now.day)
-        time_difference = now - start_of_day
-        return time_difference.total_seconds()
+        # Integer-ish math on the epoch clock; building two datetimes and a
+        # timedelta per call is needless allocation for the same answer.
+        now = time.time()
+        return (now + time.localtime(now).tm_gmtoff) % SECONDS_IN_DAY
 
     def _get_time_from_seconds_through_day(self, total_seconds: int) -> tuple[int, int, int]:
-        total_seconds %= SECONDS_IN_DAY
+        # Callers pass values already reduced mod SECONDS_IN_DAY (alarm_time
+        # is stored mod MINUTES_IN_DAY), so no wrap is needed here.
         total_minutes = total_seconds // 60
         total_hours = total_minutes // 60
         seconds = total_seconds % 60
@@ -57,6 +69,8 @@ class Clock:
 
     def set_alarm_time(self, new_time_minutes: int) -> None:
         self.alarm_time = new_time_minutes % MINUTES_IN_DAY
+        hours, minutes, _ = self._get_time_from_minutes_through_day(self.alarm_time)
+        self._alarm_string = f'{hours:2d}:{minutes:02d}'
 
     def scrub_alarm_time(self, change_minutes: int) -> None:
         self.set_alarm_time(self.alarm_time + change_minutes)
@@ -64,11 +78,11 @@ class Clock:
     def _init_alarm(self) -> None:
         if self.alarm_timer is not None:
             self.alarm_timer.cancel()
-        self.alarm_timer = threading.Timer(self._get_seconds_until_alarm(), self._prealarm)
-        self.alarm_timer.start()
+        loop = asyncio.get_event_loop()
+        self.alarm_timer = loop.call_later(self._get_seconds_until_alarm(), self._prealarm)
 
     def _prealarm(self) -> None:
-        print(">>>>> Alarm!")
+        log.info("Alarm!")
         self._init_alarm() # Should set the alarm for the next day
         if self.alarm_callback is not None:
             self.alarm_callback()
@@ -90,17 +104,24 @@ class Clock:
         return time.time() + self.current_time_offset
 
     def get_current_time_string(self, with_colon: bool = True):
-        if with_colon:
-            prestring = time.strftime('%H:%M', time.gmtime(self._get_offset_time()))
-        else:
-            prestring = time.strftime('%H %M', time.gmtime(self._get_offset_time()))
-        # Rip one leading zero (eg 01:00 -> 1:00, but 00:00 -> 0:00)
-        if prestring[0] == '0':
-            prestring = ' ' + prestring[1:]  # Replace with space otherwise break monospace layout
-        return prestring
+        offset_time = self._get_offset_time()
+        minute = int(offset_time) // 60
+        if minute != self._time_string_minute:
+            # Format both variants on a miss; a colon-blink tick asks for
+            # the other variant one second later and must also hit.
+            struct = time.gmtime(offset_time)
+            colon_string = time.strftime('%H:%M', struct)
+            space_string = time.strftime('%H %M', struct)
+            # Rip one leading zero (eg 01:00 -> 1:00, but 00:00 -> 0:00)
+            if colon_string[0] == '0':
+                colon_string = ' ' + colon_string[1:]  # Replace with space otherwise break monospace layout
+                space_string = ' ' + space_string[1:]
+            self._time_string_minute = minute
+            self._time_string_colon = colon_string
+            self._time_string_space = space_string
+        return self._time_string_colon if with_colon else self._time_string_space
 
     def get_alarm_time_string(self):
-        time_components = self._get_time_from_minutes_through_day(self.alarm_time)
-        return f'{time_components[0]:2d}:{time_components[1]:02d}'
+        return self._alarm_string
     def get_alarm_active(self):
         return self.alarm_active
@@ -1,11 +1,15 @@
 """
 Provides an interface for the rotary encoder and button.
-All callbacks must be set before starting the encoder threads with Encoder.start().
-Two looping threads execute the appropriate callback functions when the corresponding events occur.
+All callbacks must be set before starting the encoder tasks with Encoder.start().
+Two asyncio tasks on the running event loop execute the appropriate callback
+functions when the corresponding events occur.
 """
 
+import asyncio
+import ctypes
+import fcntl
+import struct
 import evdev
-import threading
 from typing import Callable
 from constants import time_now
 
@@ -14,6 +18,36 @@ ROTARY_ENCODER_DEVICE = '/dev/input/event3'
 ROTARY_ENCODER_BUTTON_DEVICE = '/dev/input/event0'
 BUTTON_LONG_PRESS_DURATION_MS = 800
 ROTARY_BUTTON_KEYCODE = 28
+# A fast spin emits many events within a few ms; batch them this long
+ROTATION_COALESCE_MS = 50
+
+def _IOW(type_char: str, nr: int, size: int) -> int:
+    return (1 << 30) | (size << 16) | (ord(type_char) << 8) | nr
+
+# EVIOCSMASK takes a struct input_mask { u32 type; u32 codes_size; u64 codes_ptr; }
+EVIOCSMASK = _IOW('E', 0x93, 16)
+
+def _set_event_mask(device: evdev.InputDevice, ev_type: int, codes: list[int]) -> None:
+    """Ask the kernel to only deliver the given codes for one event type.
+
+    Filtering in the kernel means the read tasks never wake up for events
+    that would just be discarded in Python. Best effort: kernels older than
+    4.4 don't support the ioctl, in which case the Python-side checks still
+    do the filtering.
+    """
+    if codes:
+        n_bytes = max(codes) // 8 + 1
+        mask = bytearray(n_bytes)
+        for code in codes:
+            mask[code // 8] |= 1 << (code % 8)
+        codes_buf = ctypes.create_string_buffer(bytes(mask), n_bytes)
+        arg = struct.pack('@IIQ', ev_type, n_bytes, ctypes.addressof(codes_buf))
+    else:
+        arg = struct.pack('@IIQ', ev_type, 0, 0)
+    try:
+        fcntl.ioctl(device.fd, EVIOCSMASK, arg)
+    except OSError:
+        pass
 
 class Encoder:
     def __init__(self):
@@ -21,61 +55,94 @@ class Encoder:
         self.button_long_callback = None
         self.rotate_left_callback = None
         self.rotate_right_callback = None
+        self.scrub_callback = None
+
+        self.rotation_accumulator = 0
+        self.rotation_flush_handle = None
 
         self.button = False
         self.button_start_time = 0
         self.button_timer = None
-   
+
         self.rotary_device = evdev.InputDevice(ROTARY_ENCODER_DEVICE)
         self.rotary_button_device = evdev.InputDevice(ROTARY_ENCODER_BUTTON_DEVICE)
 
-        self.rotation_thread = None
-        self.button_thread = None
+        # Filter events at the kernel: the rotary only needs REL_X and the
+        # button only its key code; drop the SYN chatter on both.
+        _set_event_mask(self.rotary_device, evdev.ecodes.EV_REL, [evdev.ecodes.REL_X])
+        _set_event_mask(self.rotary_device, evdev.ecodes.EV_SYN, [])
+        _set_event_mask(self.rotary_button_device, evdev.ecodes.EV_KEY, [ROTARY_BUTTON_KEYCODE])
+        _set_event_mask(self.rotary_button_device, evdev.ecodes.EV_SYN, [])
 
-    def _make_daemon_thread(self, function: Callable) -> None:
-        thread = threading.Thread(target=function)
-        thread.daemon = True
-        thread.start()
-        return thread
+        self.rotation_task = None
+        self.button_task = None
 
     def start(self) -> None:
-        # Note: read_loop is blocking! That's why it has to be run in its own thread
-        self.rotation_thread = self._make_daemon_thread(lambda: self.handle_rotation(self.rotary_device))
-        self.button_thread = self._make_daemon_thread(lambda: self.handle_button(self.rotary_button_device))
+        # Two tasks on the running loop; async_read_loop awaits the device
+        # fd instead of blocking a thread on read().
+        self.rotation_task = asyncio.create_task(self.handle_rotation(self.rotary_device))
+        self.button_task = asyncio.create_task(self.handle_button(self.rotary_button_device))
 
-    def handle_rotation(self, device: evdev.InputDevice) -> None:
-        for event in device.read_loop():
-            if event.type != 2: # 2 is REL_X type event, the rotation of the encoder
+    async def handle_rotation(self, device: evdev.InputDevice) -> None:
+        loop = asyncio.get_event_loop()
+        # Locals instead of attribute lookups; this loop runs per event
+        # during fast spins
+        ev_rel = evdev.ecodes.EV_REL
+        rel_x = evdev.ecodes.REL_X
+        async for event in device.async_read_loop():
+            if event.type != ev_rel or event.code != rel_x:
                 continue
-            if event.value == 1:
-                self.rotate_right_callback()
-            if event.value == -1:
-                self.rotate_left_callback()
+            # Accumulate the burst and flush once, so a fast spin becomes
+            # one net scrub instead of a callback per detent.
+            self.rotation_accumulator += event.value
+            if self.rotation_flush_handle is None:
+                self.rotation_flush_handle = loop.call_later(ROTATION_COALESCE_MS / 1000, self._flush_rotation)
+
+    def _flush_rotation(self) -> None:
+        self.rotation_flush_handle = None
+        delta = self.rotation_accumulator
+        self.rotation_accumulator = 0
+        if delta == 0:
+            return
+        if self.scrub_callback is not None:
+            self.scrub_callback(delta)
+            return
+        # Fall back to the per-tick callbacks when no scrub callback is bound
+        callback = self.rotate_right_callback if delta > 0 else self.rotate_left_callback
+        if callback is not None:
+            for _ in range(abs(delta)):
+                callback()
 
     def _check_button_long(self) -> None:
         if self.button and time_now() - self.button_start_time >= BUTTON_LONG_PRESS_DURATION_MS:
             self.button_start_time = 0
-            self.button_long_callback()
-            
-    def handle_button(self, device) -> None:
-        for event in device.read_loop():
-            if event.code != ROTARY_BUTTON_KEYCODE:
+            if self.button_long_callback is not None:
+                self.button_long_callback()
+
+    async def handle_button(self, device) -> None:
+        loop = asyncio.get_event_loop()
+        ev_key = evdev.ecodes.EV_KEY
+        keycode = ROTARY_BUTTON_KEYCODE
+        async for event in device.async_read_loop():
+            if event.type != ev_key or event.code != keycode:
                 continue
             if event.value == 1:
                 self.button = True
                 self.button_start_time = time_now()
-                self.button_timer = threading.Timer(BUTTON_LONG_PRESS_DURATION_MS/1000, self._check_button_long)
-                self.button_timer.start()
+                # call_later runs on the loop; no thread is spawned per press
+                self.button_timer = loop.call_later(BUTTON_LONG_PRESS_DURATION_MS/1000, self._check_button_long)
             else:
                 if self.button == True:
                     # Button has just been depressed
                     # Timer will catch long presses, we only detect short here.
                     self.button_timer.cancel()
-                    if time_now() - self.button_start_time < BUTTON_LONG_PRESS_DURATION_MS:
+                    if time_now() - self.button_start_time < BUTTON_LONG_PRESS_DURATION_MS and self.button_short_callback is not None:
                         self.button_short_callback()
                 self.button = False
                 self.button_start_time = 0
 
+    def set_scrub_callback(self, callback: Callable) -> None:
+        self.scrub_callback = callback
     def set_rotate_left_callback(self, callback: Callable) -> None:
         self.rotate_left_callback = callback
     def set_rotate_right_callback(self, callback: Callable) -> None:
@@ -83,4 +150,4 @@ class Encoder:
     def set_button_short_callback(self, callback: Callable) -> None:
         self.button_short_callback = callback
     def set_button_long_callback(self, callback: Callable) -> None:
-        self.button_long_callback = callback
\ No newline at end of file
+        self.button_long_callback = callback
@@ -124,26 +124,44 @@ class OLED_1in51(config.RaspberryPi):
         return buf
             
     def ShowImage(self, pBuf):
-        for page in range(0,8):
-            # set page address #
-            self.command(0xB0 + page)
-            # set low column address #
-            self.command(0x00); 
-            # set high column address #
-            self.command(0x10); 
-            # write data #
-            time.sleep(0.01)
-            if(self.Device == Device_SPI):
-                self.digital_write(self.DC_PIN,True)
-            for i in range(0,self.width):
-                if(self.Device == Device_SPI):
-                    self.spi_writebyte([~pBuf[i+self.width*page]]); 
-                else :
-                    self.i2c_writebyte(0x40, ~pBuf[i+self.width*page])
+        # Invert the whole buffer once instead of per byte on the wire
+        data = bytes((~b) & 0xFF for b in pBuf)
+        # Init sets horizontal addressing mode (0x20, 0x00), so after
+        # resetting the column/page ranges the whole framebuffer can
+        # stream out as a single run. Resetting the window here also
+        # matters after a ShowRegion, which leaves a narrowed one behind.
+        # (The old 0xB0/0x00/0x10 page-mode commands are ignored in
+        # horizontal addressing mode.)
+        self.command(0x21)
+        self.command(0x00)
+        self.command(self.width - 1)
+        self.command(0x22)
+        self.command(0x00)
+        self.command(self.height//8 - 1)
+        if(self.Device == Device_SPI):
+            self.digital_write(self.DC_PIN,True)
+            self.spi_writebytes(data)
+        else :
+            self.i2c_writebytes(0x40, data)
                        
+    def ShowRegion(self, page, col_start, pBuf):
+        """Write a run of bytes to a single page starting at col_start."""
+        data = bytes((~b) & 0xFF for b in pBuf)
+        self.command(0x21)
+        self.command(col_start)
+        self.command(col_start + len(data) - 1)
+        self.command(0x22)
+        self.command(page)
+        self.command(page)
+        if(self.Device == Device_SPI):
+            self.digital_write(self.DC_PIN,True)
+            self.spi_writebytes(data)
+        else :
+            self.i2c_writebytes(0x40, data)
+
     def clear(self):
         """Clear contents of image buffer"""
         _buffer = [0xff]*(self.width * self.height//8)
-        self.ShowImage(_buffer) 
+        self.ShowImage(_buffer)
 
        
@@ -78,8 +78,19 @@ class RaspberryPi:
     def spi_writebyte(self,data):
         self.spi.writebytes([data[0]])
 
+    def spi_writebytes(self,data):
+        # writebytes2 takes bytes/bytearray/numpy buffers without copying
+        # and without the 4096-byte chunk limit of writebytes
+        self.spi.writebytes2(data)
+
     def i2c_writebyte(self,reg, value):
         self.bus.write_byte_data(self.address, reg, value)
+
+    def i2c_writebytes(self,reg, data):
+        # Block writes carry up to 32 payload bytes per SMBus transaction
+        # instead of one, cutting the address/control overhead per byte
+        for i in range(0, len(data), 32):
+            self.bus.write_i2c_block_data(self.address, reg, list(data[i:i+32]))
     
     def module_init(self): 
         self.digital_write(self.RST_PIN,False)
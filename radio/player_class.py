@@ -1,52 +1,83 @@
 """Player class using VLC. Passing in a list of stations is required to start playback."""
+import logging
+from typing import Sequence
 import vlc
 
+log = logging.getLogger(__name__)
+
 class Player:
     """Class for interacting with VLC. Passing in a list of stations is required to start playback."""
-    def __init__(self, station_list: list[str] = None):
-        station_list = station_list or [] # Default
-        self.station_list = station_list
+    def __init__(self, station_list: Sequence[str] = None):
         self.current_station_number = 0
         self.is_playing = False
         # VLC related attributes
         self.instance = vlc.Instance()
         self.player = self.instance.media_player_new()
         self.media = None
+        # One Media descriptor per station URL, built when the list is set;
+        # station changes swap descriptors instead of rebuilding them.
+        self.media_pool = []
+        # Push-updated by the MediaMetaChanged event; get_station_track
+        # reads this instead of calling into libvlc every poll.
+        self.track_name_cache = 'unknown'
+        # Through the setter so the media pool always matches the list
+        self.set_station_list(station_list or [])
 
-    def _init_media(self, url: str) -> None:
-        self.media = self.instance.media_new(url)
+    def _init_media(self, station_number: int) -> None:
+        if self.media is not None:
+            self.media.event_manager().event_detach(vlc.EventType.MediaMetaChanged)
+        self.media = self.media_pool[station_number]
+        self.track_name_cache = 'unknown'
+        events = self.media.event_manager()
+        events.event_attach(vlc.EventType.MediaMetaChanged, self._on_meta_changed)
         self.player.set_media(self.media)
 
+    def _on_meta_changed(self, event) -> None:
+        # Runs on libvlc's event thread; stop() may have cleared the media
+        # after this callback was already in flight.
+        if self.media is None:
+            return
+        meta = self.media.get_meta(vlc.Meta.NowPlaying)
+        self.track_name_cache = meta if meta is not None else 'unknown'
+
     def _get_meta(self, e_meta: vlc.Meta) -> str:
         if self.media is None or self.media.get_meta(e_meta) is None:
             return 'unknown'
         else:
             return self.media.get_meta(e_meta)
 
-    def set_station_list(self, station_list: list[str]) -> None:
+    def set_station_list(self, station_list: Sequence[str]) -> None:
         self.station_list = station_list
+        self.media_pool = [self.instance.media_new(url) for url in station_list]
 
     def play(self) -> None:
-        print("Player starting playback")
+        log.info("Player starting playback")
         if self.media is None:
-            self._init_media(self.station_list[self.current_station_number])
+            self._init_media(self.current_station_number)
         self.player.play()
         self.is_playing = True
 
     def stop(self) -> None:
-        print("Player stopping playback")
+        log.info("Player stopping playback")
         self.player.stop()
+        if self.media is not None:
+            self.media.event_manager().event_detach(vlc.EventType.MediaMetaChanged)
         self.media = None
+        self.track_name_cache = 'unknown'
         self.is_playing = False
 
     def set_station(self, new_station_number: int) -> bool:
         if new_station_number < 0 or new_station_number >= len(self.station_list):
             return False
-        if self.is_playing: self.player.stop()
+        # Re-selecting the current station shouldn't touch the media
+        if new_station_number == self.current_station_number and self.media is not None:
+            return True
         self.current_station_number = new_station_number
-        self._init_media(self.station_list[new_station_number])
+        # No explicit stop: set_media on a playing player swaps the stream
+        # and play() picks up the new one, skipping a full teardown.
+        self._init_media(new_station_number)
         if self.is_playing: self.player.play()
-        print("Now playing station ", self.current_station_number)
+        log.info("Now playing station %d", self.current_station_number)
         return True
 
     def scrub_station(self, distance: int) -> None:
@@ -58,6 +89,6 @@ class Player:
     def get_station_title(self) -> str:
         return self._get_meta(vlc.Meta.Title)
     def get_station_track(self) -> str:
-        return self._get_meta(vlc.Meta.NowPlaying)
+        return self.track_name_cache
     def get_station_count(self) -> int:
         return len(self.station_list)
@@ -1,11 +1,14 @@
 """Radio class"""
 
-import threading
+import asyncio
+import logging
 from mode_enum import Mode
 from user_interface_class import UserInterface
 from player_class import Player
 from clock_class import Clock
 
+log = logging.getLogger(__name__)
+
 # Clock blinking
 CLOCK_BLINK_ON_MS = 500
 CLOCK_BLINK_OFF_MS = 500
@@ -13,6 +16,9 @@ CLOCK_BLINK_OFF_MS = 500
 COLON_BLINK_ON_MS = 1000
 COLON_BLINK_OFF_MS = 1000
 
+# Order the rotary steps through the modes when selecting
+_MODE_CYCLE = (Mode.STATION, Mode.TIME, Mode.ALARM)
+
 class Radio:
     def __init__(self):
         self.mode = Mode.STATION
@@ -62,15 +68,14 @@ class Radio:
             elif self.highlighted_mode == Mode.ALARM:
                 self.ui.set_time(self.clock.get_alarm_time_string())
             else:
-                print("Bug: Clock blinking when not in Time or Alarm mode!")
+                log.warning("Clock blinking when not in Time or Alarm mode!")
         else:
             self.ui.set_time("  :  ")
-        self.ui.draw_ui()
+        loop = asyncio.get_event_loop()
         if self.clock_blink_faceon:
-            self.clock_blink_timer = threading.Timer(CLOCK_BLINK_ON_MS / 1000, self._clock_blink_schedule)
+            self.clock_blink_timer = loop.call_later(CLOCK_BLINK_ON_MS / 1000, self._clock_blink_schedule)
         else:
-            self.clock_blink_timer = threading.Timer(CLOCK_BLINK_OFF_MS / 1000, self._clock_blink_schedule)
-        self.clock_blink_timer.start()
+            self.clock_blink_timer = loop.call_later(CLOCK_BLINK_OFF_MS / 1000, self._clock_blink_schedule)
     
     ### The following 3 methods are basically copies of the above 3.
 
@@ -95,71 +100,41 @@ class Radio:
         if self.highlighted_mode == Mode.STATION:
             self.ui.set_time(self.clock.get_current_time_string(self.colon_blink_faceon))
         else:
-            print("Bug: Colon blinking when not in STATION mode!")
+            log.warning("Colon blinking when not in STATION mode!")
 
-        self.ui.draw_ui()
-        # print("DEBUG: Colon blink faceon: ", self.colon_blink_faceon)
+        loop = asyncio.get_event_loop()
         if self.colon_blink_faceon:
-            self.colon_blink_timer = threading.Timer(COLON_BLINK_ON_MS / 1000, self._colon_blink_schedule)
+            self.colon_blink_timer = loop.call_later(COLON_BLINK_ON_MS / 1000, self._colon_blink_schedule)
         else:
-            self.colon_blink_timer = threading.Timer(COLON_BLINK_OFF_MS / 1000, self._colon_blink_schedule)
-        self.colon_blink_timer.start()
+            self.colon_blink_timer = loop.call_later(COLON_BLINK_OFF_MS / 1000, self._colon_blink_schedule)
 
     def active_alarm(self):
-        print(">>>>> Playing station due to alarm")
+        log.info("Playing station due to alarm")
         self.station_active = True
         self.player.play()
         self.ui.set_station_active(True)
-        self.ui.draw_ui()
 
-    # In MODE mode, scrubs highlighted mode left & update UI
-    # In STATION mode, scrubs station number left & update UI
-    # In TIME mode, scrubs current clock time left & update UI
-    # In ALARM mode, scrubs alarm clock time left & update UI
+    # In MODE mode, scrubs highlighted mode left/right & update UI
+    # In STATION mode, scrubs station number left/right & update UI
+    # In TIME mode, scrubs current clock time left/right & update UI
+    # In ALARM mode, scrubs alarm clock time left/right & update UI
     def control_left(self):
-        print("DEBUG: control_left")
-        if self.mode == Mode.MODE:
-            if self.highlighted_mode == Mode.STATION: self.highlighted_mode = Mode.ALARM
-            elif self.highlighted_mode == Mode.TIME:  self.highlighted_mode = Mode.STATION
-            elif self.highlighted_mode == Mode.ALARM: self.highlighted_mode = Mode.TIME
-
-            if self.highlighted_mode == Mode.TIME or self.highlighted_mode == Mode.ALARM:
-                self._enable_clock_blink()
-                self._disable_colon_blink()
-                if self.highlighted_mode == Mode.ALARM: self.ui.set_time(self.clock.get_alarm_time_string())
-                else: self.ui.set_time(self.clock.get_current_time_string())
-            elif self.highlighted_mode == Mode.STATION:
-                self._disable_clock_blink()
-                self._enable_colon_blink()
-            self.ui.set_selected_mode(self.highlighted_mode)
+        self._control_rotate(-1)
 
-        if self.mode == Mode.STATION:
-            self.player.scrub_station(-1)
-            self.ui.set_station_number(self.player.get_station_number())
+    def control_right(self):
+        self._control_rotate(1)
 
-        if self.mode == Mode.TIME:
-            self.clock.scrub_current_time_offset(-1)
-            self._enable_clock_blink()
-            self.ui.set_time(self.clock.get_current_time_string())
+    # Applies a whole coalesced rotation burst as one scrub
+    def control_scrub(self, distance: int) -> None:
+        if distance != 0:
+            self._control_rotate(distance)
 
-        if self.mode == Mode.ALARM:
-            self.clock.scrub_alarm_time(-1)
-            self._enable_clock_blink()
-            self.ui.set_time(self.clock.get_alarm_time_string())
-            
-        
-        self.ui.draw_ui()
-    
-    # In MODE mode, scrubs highlighted mode right & update UI
-    # In STATION mode, scrubs station number right & update UI
-    # In TIME mode, scrubs current clock time right & update UI
-    # In ALARM mode, scrubs alarm clock time right & update UI
-    def control_right(self):
-        print("DEBUG: control_right")
+    def _control_rotate(self, direction: int) -> None:
+        # The two rotation handlers were byte-for-byte duplicates except
+        # for the sign of the scrub, so both feed through here.
         if self.mode == Mode.MODE:
-            if self.highlighted_mode == Mode.STATION: self.highlighted_mode = Mode.TIME
-            elif self.highlighted_mode == Mode.TIME:  self.highlighted_mode = Mode.ALARM
-            elif self.highlighted_mode == Mode.ALARM: self.highlighted_mode = Mode.STATION
+            index = _MODE_CYCLE.index(self.highlighted_mode)
+            self.highlighted_mode = _MODE_CYCLE[(index + direction) % len(_MODE_CYCLE)]
 
             if self.highlighted_mode == Mode.TIME or self.highlighted_mode == Mode.ALARM:
                 self._enable_clock_blink()
@@ -172,25 +147,22 @@ class Radio:
             self.ui.set_selected_mode(self.highlighted_mode)
 
         if self.mode == Mode.STATION:
-            self.player.scrub_station(1)
+            self.player.scrub_station(direction)
             self.ui.set_station_number(self.player.get_station_number())
 
         if self.mode == Mode.TIME:
-            self.clock.scrub_current_time_offset(1)
+            self.clock.scrub_current_time_offset(direction)
             self._enable_clock_blink()
             self.ui.set_time(self.clock.get_current_time_string())
 
         if self.mode == Mode.ALARM:
-            self.clock.scrub_alarm_time(1)
+            self.clock.scrub_alarm_time(direction)
             self._enable_clock_blink()
             self.ui.set_time(self.clock.get_alarm_time_string())
-
-        self.ui.draw_ui()
     
     # In MODE mode, makes highlighted mode the active mode & update the UI
     # In ANY OTHER mode, makes current mode the highlighted mode, makes MODE mode the active mode, & update the UI
     def control_short_click(self):
-        print("DEBUG: control_short_click")
         if self.mode == Mode.MODE:
             self.mode = self.highlighted_mode
             self.ui.set_highlight_selector(False)
@@ -198,14 +170,13 @@ class Radio:
             self.highlighted_mode = self.mode
             self.mode = Mode.MODE
             self.ui.set_highlight_selector(True)
-        self.ui.draw_ui()
 
     # In MODE mode, does what the highlighted mode would do
     # In STATION mode, toggle the player on/off & update the UI
     # In ALARM mode, toggle the alarm on/off & update the UI
     # In TIME mode, resets the time to system time & update the UI
     def control_long_click(self):
-        print("DEBUG: control_long_click")
+        log.debug("control_long_click")
         if self.highlighted_mode == Mode.STATION:
             self._toggle_player()
         if self.highlighted_mode == Mode.ALARM:
@@ -213,16 +184,15 @@ class Radio:
         if self.highlighted_mode == Mode.TIME:
             self.clock.set_time_to_system_time()
             self.ui.set_time(self.clock.get_current_time_string())
-        self.ui.draw_ui()
 
     def _toggle_player(self) -> None:
-        print("DEBUG: _toggle_player")
+        log.debug("_toggle_player")
         self.station_active = not self.station_active
         self.ui.set_station_active(self.station_active)
         if self.station_active: self.player.play()
         else: self.player.stop()
     def _toggle_alarm(self) -> None:
-        print("DEBUG: _toggle_alarm")
+        log.debug("_toggle_alarm")
         self.alarm_active = not self.alarm_active
         self.ui.set_alarm_active(self.alarm_active)
         self.clock.set_alarm_active(self.alarm_active)
@@ -2,9 +2,11 @@
 User interface class for the radio.
 """
 
-import threading
+import asyncio
 import os
-import math
+import queue
+import threading
+import numpy as np
 import lib.OLED_1in51 as OLED_1in51
 from PIL import Image, ImageDraw, ImageFont
 from constants import time_now
@@ -22,6 +24,21 @@ SCREEN_FRAME_UPDATE_DURATION_MS = 150
 # FONT_RESOURCE = os.path.join(assetdir, 'noto_mono.ttf')
 FONT_RESOURCE = os.path.join(os.path.dirname(__file__), 'asset/noto_mono.ttf')
 
+# Every possible zero-padded station string, built once.
+_STATION_STRS = tuple(format(i, "03d") for i in range(1000))
+
+# Fixed UI geometry, allocated once at import
+_SEP_LINE = ((27, 42), (27, 58))
+_STATION_DOT = ((120, 10), (126, 16))
+_TIME_DOT = ((120, 25), (126, 31))
+_ALARM_DOT = ((120, 40), (126, 46))
+_SELECTOR = {
+    Mode.STATION: ((115, 12), (115, 14)),
+    Mode.TIME: ((115, 27), (115, 29)),
+    Mode.ALARM: ((115, 42), (115, 44)),
+}
+
+
 
 # Call set functions to update the UI.
 # The UI does not modify external state.
@@ -30,57 +47,122 @@ class UserInterface:
         self.track_name = ""
         self.time = ""
         self.station_number = ""
+        self.station_number_int = -1
         self.selected_mode = Mode.STATION
         self.highlight_selector = False
         self.alarm_active = False
         self.station_active = False
 
         self.track_start_time = 0
+        self.last_scroll_index = 0
+        # Every visible window of the track name, built per track change
+        self.scroll_slices = ("",)
 
         self.display = OLED_1in51.OLED_1in51()
         self.display.Init()
         self.display.clear()
 
+        # Load the two font sizes once; truetype() reopens and reparses
+        # the TTF file on every call.
+        self._time_font = ImageFont.truetype(FONT_RESOURCE, 35)
+        self._station_font = ImageFont.truetype(FONT_RESOURCE, 10)
+
+        # The clock only ever shows these 12 glyphs. Rasterize each once;
+        # drawing the time is then a few pastes instead of a freetype pass
+        # per frame. paste() has no mask and blanks its whole rectangle, so
+        # the cells stop above the separator line (digit ink ends well
+        # before it), and each keeps its own advance -- ':' is narrower
+        # than the digits in this font, so a fixed step would shift
+        # everything after it.
+        glyph_height = min(sum(self._time_font.getmetrics()), _SEP_LINE[0][1])
+        self._time_glyphs = {}
+        for ch in "0123456789: ":
+            advance = self._time_font.getlength(ch)
+            glyph = Image.new('1', (int(advance), glyph_height), "WHITE")
+            ImageDraw.Draw(glyph).text((0, 0), ch, font = self._time_font, fill = 0)
+            self._time_glyphs[ch] = (glyph, advance)
+
+        # Static layer: separator and mode circle outlines never change,
+        # so draw them once and start each frame from a copy.
+        self._bg = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")
+        bg_draw = ImageDraw.Draw(self._bg)
+        bg_draw.line(_SEP_LINE, None, 1)
+        bg_draw.ellipse(_STATION_DOT, "WHITE", 0, 1)
+        bg_draw.ellipse(_TIME_DOT, "WHITE", 0, 1)
+        bg_draw.ellipse(_ALARM_DOT, "WHITE", 0, 1)
+
+        # Working frame: one Image and one Draw handle reused every frame;
+        # each draw starts by pasting the static layer back over it.
+        self._frame = self._bg.copy()
+        self._frame_draw = ImageDraw.Draw(self._frame)
+
         self.update_required = True
         self.scroll_speed = 300
         self.max_chars = 13
+        self.ends_hold_multiple = 3
+        # Scroll cycle constants, recomputed when the track name changes
+        self.scroll_overflow = 0
+        self.scroll_cycle_length = 1
+        self.scroll_cycle_discrete = 0
         self.update_schedule_timer = None
 
         self.last_draw = time_now()
         self.update_timer = None
-        self.draw_lock = threading.Lock()
-
-    def _get_scrolling_track_name(self, max_chars: int = 13, scroll_speed: int = 300, ends_hold_multiple: int = 3):
-        overflow_size = len(self.track_name) - max_chars
-        # If length of text fits within bounds, we don't need to do anything
-        if overflow_size <= 0:
-            return self.track_name
-
-        cycle_length = (scroll_speed * ends_hold_multiple * 2) + (overflow_size * scroll_speed)
-        cycle_position = (time_now() - self.track_start_time) % cycle_length
-        cycle_discrete = ends_hold_multiple*2 + overflow_size
-        cycle_index = math.floor((cycle_position / cycle_length) * cycle_discrete)
-        char_index = min(max(cycle_index - ends_hold_multiple, 0), overflow_size)
-
-        truncated_track_name = self.track_name[char_index:char_index+max_chars]
-        return truncated_track_name
-    
+        # Last buffer pushed to the panel, for partial-update diffing
+        # (only the writer thread touches this)
+        self.prev_buffer = None
+        # The bus write is the slow half of a frame; hand packed buffers to
+        # a writer thread so the loop can compose the next frame meanwhile.
+        # maxsize=1 with drop-stale puts means the panel always gets the
+        # newest frame and never a backlog.
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._writer_thread = threading.Thread(target=self._display_worker, daemon=True)
+        self._writer_thread.start()
+
+    def _get_scroll_char_index(self) -> int:
+        # If length of text fits within bounds, we don't scroll at all
+        if self.scroll_overflow == 0:
+            return 0
+        cycle_position = (time_now() - self.track_start_time) % self.scroll_cycle_length
+        # Pure integer math; all operands are ints
+        cycle_index = (cycle_position * self.scroll_cycle_discrete) // self.scroll_cycle_length
+        return min(max(cycle_index - self.ends_hold_multiple, 0), self.scroll_overflow)
+
+    def _get_scrolling_track_name(self):
+        # The schedule timer is the producer of the scroll index; the draw
+        # path just indexes the precomputed window table with it.
+        return self.scroll_slices[self.last_scroll_index]
+
     def set_track_name(self, new_track_name: str) -> None:
         if new_track_name == self.track_name:
             return
         self.track_name = new_track_name
+        # The cycle constants only change with the track name, so compute
+        # them here rather than on every scroll tick
+        self.scroll_overflow = max(len(new_track_name) - self.max_chars, 0)
+        self.scroll_cycle_length = (self.scroll_speed * self.ends_hold_multiple * 2) + (self.scroll_overflow * self.scroll_speed)
+        self.scroll_cycle_discrete = self.ends_hold_multiple*2 + self.scroll_overflow
+        # There are only overflow+1 distinct windows; slice them all now so
+        # the scroll tick never touches the string again
+        self.scroll_slices = tuple(new_track_name[i:i+self.max_chars] for i in range(self.scroll_overflow + 1))
         self.track_start_time = time_now()
+        self.last_scroll_index = 0
+        self.update_required = True
         self._update_schedule()
 
     def _update_schedule(self):
-        self.update_required = True
+        # Only mark dirty when the scroll window actually moved; during the
+        # hold periods at either end the index repeats for several ticks.
+        char_index = self._get_scroll_char_index()
+        if char_index != self.last_scroll_index:
+            self.last_scroll_index = char_index
+            self.update_required = True
         if self.update_schedule_timer is not None:
             self.update_schedule_timer.cancel()
         if len(self.track_name) > self.max_chars:
-            # We are scrolling, so we need to update the schedule thread
-            self.update_schedule_timer = threading.Timer(self.scroll_speed / 1000, self._update_schedule)
-            self.update_schedule_timer.start()
-        self.draw_ui()
+            # We are scrolling, so we need to re-arm the schedule callback
+            loop = asyncio.get_event_loop()
+            self.update_schedule_timer = loop.call_later(self.scroll_speed / 1000, self._update_schedule)
 
     def set_time(self, new_time: str) -> None:
         if self.time == new_time:
@@ -89,10 +171,11 @@ class UserInterface:
         self.update_required = True
 
     def set_station_number(self, new_station_number: int) -> None:
-        padded_number = str(new_station_number).zfill(3)
-        if self.station_number == padded_number:
+        # Compare on the int and only then touch the string table
+        if new_station_number == self.station_number_int:
             return
-        self.station_number = padded_number
+        self.station_number_int = new_station_number
+        self.station_number = _STATION_STRS[new_station_number]
         self.update_required = True
 
     def set_selected_mode(self, new_mode: Mode) -> None:
@@ -121,21 +204,70 @@ class UserInterface:
 
     def clear(self):
         self.display.clear()
+        self.prev_buffer = None
+
+    def _pack(self, image: Image) -> bytes:
+        """Pack the frame into page-major column bytes, panel flip included.
+
+        The vendor driver walks every pixel in Python; packbits builds the
+        same layout (bit 0 = top row of a page) in one pass, and the
+        180-degree flip rides along as a stride view of the pixel array so
+        the raster is only traversed once.
+        """
+        arr = np.asarray(image.convert('1'), dtype=np.uint8)[::-1, ::-1]
+        pages = arr.reshape(OLED_HEIGHT // 8, 8, OLED_WIDTH)
+        return np.packbits(pages, axis=1, bitorder='little').tobytes()
+
+    def _flush_image(self, image: Image):
+        # Pack on the loop thread (immutable bytes, so no tearing), then
+        # queue for the writer thread; replace any frame it hasn't taken.
+        buffer = self._pack(image)
+        try:
+            self._frame_queue.put_nowait(buffer)
+        except queue.Full:
+            try:
+                self._frame_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._frame_queue.put_nowait(buffer)
+
+    def _display_worker(self):
+        while True:
+            buffer = self._frame_queue.get()
+            self._push_buffer(buffer)
+
+    def _push_buffer(self, buffer: bytes):
+        # The SPI transfer is the bottleneck, so diff against the previous
+        # frame and push only the changed column run of each 8-pixel page.
+        # The scan itself runs vectorized in numpy rather than as a Python
+        # loop over 1024 bytes.
+        if self.prev_buffer is None:
+            self.display.ShowImage(buffer)
+        else:
+            diff = np.frombuffer(buffer, dtype=np.uint8).reshape(OLED_HEIGHT // 8, OLED_WIDTH) \
+                != np.frombuffer(self.prev_buffer, dtype=np.uint8).reshape(OLED_HEIGHT // 8, OLED_WIDTH)
+            for page in np.nonzero(diff.any(axis=1))[0]:
+                cols = np.nonzero(diff[page])[0]
+                page = int(page)  # spidev rejects numpy ints
+                base = page * OLED_WIDTH
+                start = int(cols[0])
+                end = int(cols[-1]) + 1
+                self.display.ShowRegion(page, start, buffer[base+start:base+end])
+        self.prev_buffer = buffer
 
     def _schedule_draw(self, image: Image):
-        with self.draw_lock:
-            if self.update_timer is not None:
-                self.update_timer.cancel()
-            # If it has been long enough since the last frame, draw the image.
-            if time_now() - self.last_draw >= SCREEN_FRAME_UPDATE_DURATION_MS:
-                self.last_draw = time_now()
-                print("Drawing image, after ", time_now() - self.last_draw)
-                self.display.ShowImage(self.display.getbuffer(image))
-            # Otherwise, come back in X ms to try again.
-            else:
-                time_left = SCREEN_FRAME_UPDATE_DURATION_MS - (time_now() - self.last_draw)
-                self.update_timer = threading.Timer(time_left / 1000, lambda: self._schedule_draw(image))
-                self.update_timer.start()
+        # Everything runs on the event loop thread now, so no lock is needed
+        if self.update_timer is not None:
+            self.update_timer.cancel()
+        # If it has been long enough since the last frame, draw the image.
+        if time_now() - self.last_draw >= SCREEN_FRAME_UPDATE_DURATION_MS:
+            self.last_draw = time_now()
+            self._flush_image(image)
+        # Otherwise, come back in X ms to try again.
+        else:
+            time_left = SCREEN_FRAME_UPDATE_DURATION_MS - (time_now() - self.last_draw)
+            loop = asyncio.get_event_loop()
+            self.update_timer = loop.call_later(time_left / 1000, lambda: self._schedule_draw(image))
 
 
     def draw_ui(self):
@@ -144,31 +276,29 @@ class UserInterface:
             return
         self.update_required = False
 
-        image = Image.new('1', (OLED_WIDTH, OLED_HEIGHT), "WHITE")
-        draw = ImageDraw.Draw(image)
-        time_font = ImageFont.truetype(FONT_RESOURCE, 35)
-        station_font = ImageFont.truetype(FONT_RESOURCE, 10)
+        self._frame.paste(self._bg, (0, 0))
+        draw = self._frame_draw
 
-        # Draw time
-        draw.text((5, 0), self.time, font = time_font, fill = 0)
+        # Draw time by pasting pre-rendered glyphs at their own advances
+        x = 5.0
+        for ch in self.time:
+            glyph, advance = self._time_glyphs[ch]
+            self._frame.paste(glyph, (int(x), 0))
+            x += advance
         # Draw station number
-        draw.text((5, 45), self.station_number, font = station_font, fill = 0)
-        # Draw separator
-        draw.line([(27, 42), (27, 58)], None, 1)
+        draw.text((5, 45), self.station_number, font = self._station_font, fill = 0)
         # Draw track name
         scrolled_track_name = self._get_scrolling_track_name()
-        draw.text((31, 45), scrolled_track_name, font = station_font, fill = 0)
-        # Draw modes
-        draw.ellipse([(120, 10), (126, 16)], "WHITE", 0, 6 if self.station_active else 1) # Station Mode
-        draw.ellipse([(120, 25), (126, 31)], "WHITE", 0, 1) # Time Mode
-        draw.ellipse([(120, 40), (126, 46)], "WHITE", 0, 6 if self.alarm_active else 1) # Alarm Mode
+        draw.text((31, 45), scrolled_track_name, font = self._station_font, fill = 0)
+        # Fill in mode circles (outlines are part of the background layer)
+        if self.station_active:
+            draw.ellipse(_STATION_DOT, "WHITE", 0, 6)
+        if self.alarm_active:
+            draw.ellipse(_ALARM_DOT, "WHITE", 0, 6)
         # Draw mode selection box
-        if self.selected_mode == Mode.STATION:
-            draw.line([(115, 12), (115, 14)], None, 3 if self.highlight_selector else 1)
-        if self.selected_mode == Mode.TIME:
-            draw.line([(115, 27), (115, 29)], None, 3 if self.highlight_selector else 1)
-        if self.selected_mode == Mode.ALARM:
-            draw.line([(115, 42), (115, 44)], None, 3 if self.highlight_selector else 1)
-        # Render drawings onto screen
-        image = image.rotate(180)
-        self._schedule_draw(image)
\ No newline at end of file
+        selector = _SELECTOR.get(self.selected_mode)
+        if selector is not None:
+            draw.line(selector, None, 3 if self.highlight_selector else 1)
+        # Render drawings onto screen (the 180-degree flip happens on the
+        # packed buffer in _flush_image, not as a PIL transform)
+        self._schedule_draw(self._frame)
\ No newline at end of file